@@ -6,18 +6,95 @@ Custom AI model training specifically for Go development
 
 import os
 import json
+import asyncio
+import httpx
+import orjson
 import requests
 import time
 import re
-from typing import List, Dict, Optional
+import math
+import html
+from typing import List, Dict, Iterator, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from collections import Counter
 import logging
+import hashlib
+import sqlite3
+import shutil
+import subprocess
+from urllib.parse import urlencode
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Prefer RE2 for the Go declaration scans: it matches in linear time, so large
+# files cannot trigger catastrophic backtracking. Flags are given inline
+# because re2.compile does not accept re-module flag arguments.
+try:
+    import re2 as re_engine
+except ImportError:
+    re_engine = re
+
+# selectolax parses HTML in C; fall back to regex extraction without it
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# numpy is only needed for the keyword feature matrix
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# pandas vectorizes deduplication of the collected pairs when available
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# transformers provides the fast tokenizer used to encode the dataset
+try:
+    from transformers import AutoTokenizer
+except ImportError:
+    AutoTokenizer = None
+
+# pyarrow is only needed for the Parquet training data format
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# Precompiled regex patterns. The cleaning passes run once per file and
+# cannot backtrack badly, so they stay on the C re engine: the re2 binding
+# drives sub() from Python and is an order of magnitude slower there.
+_RE_LINE_COMMENT = re.compile(r'(?m)//.*$')
+_RE_BLOCK_COMMENT = re.compile(r'(?s)/\*.*?\*/')
+_RE_BLANK_LINES = re.compile(r'\n\s*\n')
+# Any <pre> whose class list contains the "code" token, like the pre.code selector
+_RE_CODE_BLOCK = re.compile(
+    r'<pre\b[^>]*?\sclass=["\'](?:[^"\']*\s)?code(?:\s[^"\']*)?["\'][^>]*>(.*?)</pre>', re.DOTALL
+)
+_RE_HTML_TAG = re.compile(r'<[^>]+>')
+
+def _declaration_patterns(engine) -> Tuple:
+    """Compile the func, interface and struct patterns for a regex engine"""
+    # RE2's \w is ASCII-only, but Go identifiers may contain any Unicode
+    # letter, so spell the identifier class out per engine
+    ident = r'[^\W\d]\w*' if engine is re else r'[\p{L}_][\p{L}\p{N}_]*'
+    return (
+        engine.compile(rf'(?s)func\s+{ident}\s*\([^)]*\)\s*(?:{ident}\s+)?\{{[^}}]*\}}'),
+        engine.compile(rf'(?s)type\s+{ident}\s+interface\s*\{{[^}}]*\}}'),
+        engine.compile(rf'(?s)type\s+{ident}\s+struct\s*\{{[^}}]*\}}'),
+    )
+
+_RE_FUNC, _RE_IFACE, _RE_STRUCT = _declaration_patterns(re_engine)
+
 @dataclass
 class TrainingConfig:
     """Configuration for model training"""
@@ -33,54 +110,227 @@ class TrainingConfig:
     eval_steps: int = 1000
     logging_steps: int = 100
 
-class GitHubGoScraper:
-    """Scraper for GitHub Go repositories"""
+@dataclass(slots=True)
+class TrainingPair:
+    """Prompt/completion pair for fine-tuning"""
+    prompt: str
+    completion: str
+    kind: str = ""  # "explain", "generate", "debug" or "improve"
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+GRAPHQL_RATE_LIMIT_DELAY = 60.0
+SEARCH_RESULTS_CAP = 1000
+WRITE_BUFFER_SIZE = 1 << 20
+MIN_COMPLETION_LENGTH = 32
+MAX_COMPLETION_LENGTH = 4096
+
+# Training pair templates
+SNIPPET_LENGTH = 500
+EXPLAIN_PROMPT = "Explain this Go code:\n\n"
+EXPLAIN_COMPLETION = "Here's what it does:\n\n[Detailed explanation of the code structure, functionality, and Go-specific patterns used]"
+GENERATE_PROMPT = "Write Go code for: "
+DEBUG_PROMPT = "Debug this Go code:\n\n"
+DEBUG_COMPLETION = "Here are potential issues and improvements:\n\n[Analysis of code quality, potential bugs, and Go best practices]"
+IMPROVE_PROMPT = "Improve this Go code:\n\n"
+IMPROVE_COMPLETION = "Here's an improved version following Go best practices:\n\n[Refactored code with explanations of improvements]"
+
+class ResponseCache:
+    """On-disk cache of GitHub responses keyed by URL and revalidated by ETag"""
+    
+    def __init__(self, path: str = ".gh_cache.sqlite", expire_after: int = 86400):
+        self.expire_after = expire_after
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, etag TEXT, body BLOB, fetched_at REAL)"
+        )
+    
+    def get(self, key: str) -> Optional[Tuple[Optional[str], bytes, bool]]:
+        """Return (etag, body, is_fresh) for a cached response, if any"""
+        row = self.conn.execute(
+            "SELECT etag, body, fetched_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        etag, body, fetched_at = row
+        return etag, body, time.time() - fetched_at < self.expire_after
+    
+    def set(self, key: str, etag: Optional[str], body: bytes):
+        """Store a response body and its ETag"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+            (key, etag, body, time.time())
+        )
+        self.conn.commit()
+    
+    def touch(self, key: str):
+        """Mark a cached response as revalidated"""
+        self.conn.execute(
+            "UPDATE responses SET fetched_at = ? WHERE key = ?", (time.time(), key)
+        )
+        self.conn.commit()
+    
+    def close(self):
+        self.conn.close()
+
+class AsyncGitHubGoScraper:
+    """Async scraper for GitHub Go repositories"""
     
-    def __init__(self, token: str):
+    def __init__(self, token: str, max_concurrency: int = 20, max_retries: int = 3,
+                 cache_path: Optional[str] = ".gh_cache.sqlite", graphql_batch_size: int = 100):
         self.token = token
         self.headers = {
             'Authorization': f'token {token}',
             'Accept': 'application/vnd.github.v3+json'
         }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        self.max_retries = max_retries
+        self.graphql_batch_size = graphql_batch_size
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.limits = httpx.Limits(max_connections=max_concurrency,
+                                   max_keepalive_connections=max_concurrency)
+        self.client: Optional[httpx.AsyncClient] = None
+        self.cache = ResponseCache(cache_path) if cache_path else None
+        # Monotonic time before which no request may be sent (rate limit backoff)
+        self._resume_at = 0.0
+    
+    async def __aenter__(self):
+        # HTTP/2 multiplexes concurrent requests over one connection per host
+        self.client = httpx.AsyncClient(http2=True, limits=self.limits, headers=self.headers,
+                                        timeout=30.0, follow_redirects=True)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.client.aclose()
+        if self.cache:
+            self.cache.close()
+    
+    def _backoff_delay(self, headers) -> Optional[float]:
+        """Seconds to wait according to GitHub rate limit headers, if any"""
+        if 'Retry-After' in headers:
+            return float(headers['Retry-After'])
+        if headers.get('X-RateLimit-Remaining') == '0' and 'X-RateLimit-Reset' in headers:
+            return max(0.0, float(headers['X-RateLimit-Reset']) - time.time()) + 1
+        return None
+    
+    async def _request(self, method: str, url: str, params: Optional[Dict] = None,
+                       headers: Optional[Dict] = None, data: Optional[bytes] = None,
+                       graphql: bool = False) -> bytes:
+        """Send a GitHub request, using the response cache and backing off when the rate limit is hit
+        
+        GraphQL failures arrive as HTTP 200 with an errors array, so for
+        graphql requests those replies are never cached and a RATE_LIMITED
+        error is retried like a 403/429.
+        """
+        key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+        if headers and 'Accept' in headers:
+            key = f"{key} [{headers['Accept']}]"
+        if data is not None:
+            key = f"{method} {key} {hashlib.sha256(data).hexdigest()}"
+        
+        cached = self.cache.get(key) if self.cache else None
+        if cached:
+            etag, body, is_fresh = cached
+            if is_fresh:
+                return body
+            if etag:
+                # A 304 reply does not count against the rate limit
+                headers = {**(headers or {}), 'If-None-Match': etag}
+        
+        async with self.semaphore:
+            for attempt in range(self.max_retries + 1):
+                delay = self._resume_at - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                
+                response = await self.client.request(method, url, params=params, headers=headers,
+                                                     content=data)
+                delay = self._backoff_delay(response.headers)
+                if delay is not None:
+                    self._resume_at = max(self._resume_at, time.monotonic() + delay)
+                
+                if response.status_code in (403, 429) and delay is not None and attempt < self.max_retries:
+                    logger.warning(f"Rate limited by GitHub, retrying in {delay:.0f}s")
+                    continue
+                
+                if response.status_code == 304 and cached:
+                    self.cache.touch(key)
+                    return cached[1]
+                
+                response.raise_for_status()
+                
+                errors = self._graphql_errors(response.content) if graphql else None
+                if errors:
+                    if any(error.get('type') == 'RATE_LIMITED' for error in errors):
+                        delay = delay if delay is not None else GRAPHQL_RATE_LIMIT_DELAY
+                        self._resume_at = max(self._resume_at, time.monotonic() + delay)
+                        if attempt < self.max_retries:
+                            logger.warning(f"Rate limited by GitHub GraphQL, retrying in {delay:.0f}s")
+                            continue
+                    return response.content
+                
+                if self.cache:
+                    self.cache.set(key, response.headers.get('ETag'), response.content)
+                return response.content
+    
+    def _graphql_errors(self, body: bytes) -> Optional[List[Dict]]:
+        """Return the errors array of a GraphQL response body, if any"""
+        # Cheap substring check first so successful replies are decoded only once
+        if b'"errors"' not in body:
+            return None
+        try:
+            return orjson.loads(body).get('errors')
+        except orjson.JSONDecodeError:
+            return None
+    
+    async def _get_json(self, url: str, params: Optional[Dict] = None):
+        """GET a GitHub API URL and decode the JSON response"""
+        return orjson.loads(await self._request('GET', url, params=params))
     
-    def get_top_go_repos(self, limit: int = 1000) -> List[Dict]:
+    async def _post_graphql(self, query: str, variables: Dict):
+        """Run a GitHub GraphQL query and decode the JSON response"""
+        payload = orjson.dumps({'query': query, 'variables': variables})
+        body = await self._request('POST', GITHUB_GRAPHQL_URL, data=payload,
+                                   headers={'Content-Type': 'application/json'}, graphql=True)
+        return orjson.loads(body)
+    
+    async def get_top_go_repos(self, limit: int = 1000) -> List[Dict]:
         """Get top Go repositories by stars"""
         logger.info(f"Fetching top {limit} Go repositories...")
         repos = []
-        page = 1
         
-        while len(repos) < limit:
+        # The search API serves at most 1000 results. Pages must share one
+        # page size for their offsets to line up, so spread the limit evenly.
+        limit = min(limit, SEARCH_RESULTS_CAP)
+        pages = math.ceil(limit / 100)
+        per_page = math.ceil(limit / pages) if pages else 0
+        
+        for page in range(1, pages + 1):
             url = "https://api.github.com/search/repositories"
             params = {
                 'q': 'language:go',
                 'sort': 'stars',
                 'order': 'desc',
-                'per_page': 100,
+                'per_page': per_page,
                 'page': page
             }
             
             try:
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
+                data = await self._get_json(url, params=params)
                 repos.extend(data['items'])
-                page += 1
-                
-                # Rate limiting
-                time.sleep(1)
                 
                 logger.info(f"Fetched {len(repos)} repositories so far...")
                 
-            except requests.RequestException as e:
+                # A short page means there are no further results
+                if len(data['items']) < per_page:
+                    break
+                
+            except httpx.HTTPError as e:
                 logger.error(f"Error fetching repositories: {e}")
                 break
         
         return repos[:limit]
     
-    def get_repo_files(self, repo: str, max_files: int = 100) -> List[Dict]:
+    async def get_repo_files(self, repo: str, max_files: int = 100) -> List[Dict]:
         """Get Go files from a repository"""
         logger.info(f"Fetching files from {repo}...")
         
@@ -89,10 +339,7 @@ class GitHubGoScraper:
             url = f"https://api.github.com/repos/{repo}/git/trees/main"
             params = {'recursive': '1'}
             
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            
-            tree = response.json()
+            tree = await self._get_json(url, params=params)
             go_files = []
             
             for item in tree.get('tree', []):
@@ -103,29 +350,45 @@ class GitHubGoScraper:
             
             return go_files
             
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Error fetching files from {repo}: {e}")
             return []
     
-    def download_file_content(self, repo: str, path: str) -> Optional[str]:
-        """Download file content from GitHub"""
-        try:
-            url = f"https://api.github.com/repos/{repo}/contents/{path}"
-            response = self.session.get(url)
-            response.raise_for_status()
+    async def download_files(self, repo: str, paths: List[str]) -> List[Optional[str]]:
+        """Download several files from a repository with batched GraphQL queries"""
+        owner, name = repo.split('/', 1)
+        contents: List[Optional[str]] = []
+        
+        for start in range(0, len(paths), self.graphql_batch_size):
+            batch = paths[start:start + self.graphql_batch_size]
             
-            data = response.json()
-            import base64
-            content = base64.b64decode(data['content']).decode('utf-8')
+            # One aliased object lookup per path, e.g. f0: object(expression: "HEAD:main.go")
+            declarations = ''.join(f', $e{i}: String!' for i in range(len(batch)))
+            fields = ' '.join(
+                f'f{i}: object(expression: $e{i}) {{ ... on Blob {{ text }} }}'
+                for i in range(len(batch))
+            )
+            query = (
+                f'query($owner: String!, $name: String!{declarations}) '
+                f'{{ repository(owner: $owner, name: $name) {{ {fields} }} }}'
+            )
+            variables = {'owner': owner, 'name': name}
+            variables.update({f'e{i}': f'HEAD:{path}' for i, path in enumerate(batch)})
             
-            # Rate limiting
-            time.sleep(0.1)
+            try:
+                result = await self._post_graphql(query, variables)
+            except httpx.HTTPError as e:
+                logger.error(f"Error downloading files from {repo}: {e}")
+                contents.extend([None] * len(batch))
+                continue
             
-            return content
+            if result.get('errors'):
+                logger.warning(f"GraphQL errors for {repo}: {result['errors']}")
             
-        except requests.RequestException as e:
-            logger.error(f"Error downloading {path} from {repo}: {e}")
-            return None
+            repository = (result.get('data') or {}).get('repository') or {}
+            contents.extend((repository.get(f'f{i}') or {}).get('text') for i in range(len(batch)))
+        
+        return contents
 
 class GoDataProcessor:
     """Process and clean Go code data"""
@@ -137,15 +400,20 @@ class GoDataProcessor:
             'if', 'else', 'for', 'range', 'switch', 'case', 'default',
             'return', 'break', 'continue', 'fallthrough', 'goto'
         }
+        # Column order of the keyword feature matrix
+        self.keyword_order = sorted(self.go_keywords)
+        self._keyword_pattern = re.compile(
+            r'\b(?:' + '|'.join(map(re.escape, self.keyword_order)) + r')\b'
+        )
     
     def clean_go_code(self, code: str) -> str:
         """Clean and normalize Go code"""
         # Remove comments
-        code = re.sub(r'//.*$', '', code, flags=re.MULTILINE)
-        code = re.sub(r'/\*.*?\*/', '', code, flags=re.DOTALL)
+        code = _RE_LINE_COMMENT.sub('', code)
+        code = _RE_BLOCK_COMMENT.sub('', code)
         
         # Remove extra whitespace
-        code = re.sub(r'\n\s*\n', '\n', code)
+        code = _RE_BLANK_LINES.sub('\n', code)
         code = code.strip()
         
         return code
@@ -155,53 +423,114 @@ class GoDataProcessor:
         patterns = []
         
         # Function definitions
-        func_pattern = r'func\s+\w+\s*\([^)]*\)\s*(?:\w+\s+)?\{[^}]*\}'
-        patterns.extend(re.findall(func_pattern, code, re.DOTALL))
+        patterns.extend(_RE_FUNC.findall(code))
         
         # Interface definitions
-        interface_pattern = r'type\s+\w+\s+interface\s*\{[^}]*\}'
-        patterns.extend(re.findall(interface_pattern, code, re.DOTALL))
+        patterns.extend(_RE_IFACE.findall(code))
         
         # Struct definitions
-        struct_pattern = r'type\s+\w+\s+struct\s*\{[^}]*\}'
-        patterns.extend(re.findall(struct_pattern, code, re.DOTALL))
+        patterns.extend(_RE_STRUCT.findall(code))
         
         return patterns
     
-    def create_training_pairs(self, code: str, context: str = "") -> List[Dict]:
+    def keyword_features(self, codes: List[str]) -> "np.ndarray":
+        """Count Go keywords per file as an int64 matrix (files x keyword_order)
+        
+        Useful for stratified sampling of the corpus and as a cheap
+        fingerprint for near-duplicate detection.
+        """
+        if np is None:
+            raise ImportError("numpy is required to build keyword features")
+        
+        features = np.zeros((len(codes), len(self.keyword_order)), dtype=np.int64)
+        
+        for row, code in enumerate(codes):
+            # One C-level scan per file; Counter tallies the matches in C as well
+            counts = Counter(self._keyword_pattern.findall(code))
+            features[row] = [counts[keyword] for keyword in self.keyword_order]
+        
+        return features
+    
+    def create_training_pairs(self, code: str, context: str = "") -> List[TrainingPair]:
         """Create training pairs for fine-tuning"""
         pairs = []
         
         if not code.strip():
             return pairs
         
+        # Sliced once; two-part prompts are built with a single concatenation
+        snippet = code[:SNIPPET_LENGTH]
+        
         # Code explanation pairs
-        pairs.append({
-            "prompt": f"Explain this Go code:\n\n{code[:500]}",
-            "completion": f"This Go code {context}. Here's what it does:\n\n[Detailed explanation of the code structure, functionality, and Go-specific patterns used]"
-        })
+        pairs.append(TrainingPair(
+            prompt=EXPLAIN_PROMPT + snippet,
+            completion=f"This Go code {context}. {EXPLAIN_COMPLETION}",
+            kind="explain"
+        ))
         
         # Code generation pairs
         if context:
-            pairs.append({
-                "prompt": f"Write Go code for: {context}",
-                "completion": code[:500]
-            })
+            pairs.append(TrainingPair(
+                prompt=GENERATE_PROMPT + context,
+                completion=snippet,
+                kind="generate"
+            ))
         
         # Debugging pairs
-        pairs.append({
-            "prompt": f"Debug this Go code:\n\n{code[:500]}",
-            "completion": f"Here are potential issues and improvements:\n\n[Analysis of code quality, potential bugs, and Go best practices]"
-        })
+        pairs.append(TrainingPair(
+            prompt=DEBUG_PROMPT + snippet,
+            completion=DEBUG_COMPLETION,
+            kind="debug"
+        ))
         
         # Best practices pairs
-        pairs.append({
-            "prompt": f"Improve this Go code:\n\n{code[:500]}",
-            "completion": f"Here's an improved version following Go best practices:\n\n[Refactored code with explanations of improvements]"
-        })
+        pairs.append(TrainingPair(
+            prompt=IMPROVE_PROMPT + snippet,
+            completion=IMPROVE_COMPLETION,
+            kind="improve"
+        ))
         
         return pairs
 
+_processor = GoDataProcessor()
+
+def process_go_files(contents: List[Optional[str]], context: str) -> List[TrainingPair]:
+    """Clean downloaded Go files and create their training pairs (runs in worker processes)"""
+    pairs = []
+    
+    for content in contents:
+        if content:
+            cleaned_code = _processor.clean_go_code(content)
+            if cleaned_code:
+                pairs.extend(_processor.create_training_pairs(cleaned_code, context))
+    
+    return pairs
+
+def _completion_in_range(pair: TrainingPair, min_length: int = MIN_COMPLETION_LENGTH,
+                         max_length: int = MAX_COMPLETION_LENGTH) -> bool:
+    """Whether a pair's completion length is within the training range"""
+    return min_length <= len(pair.completion) <= max_length
+
+def _require_pyarrow():
+    """Fail clearly when Parquet support is requested without pyarrow"""
+    if pq is None:
+        raise ImportError("pyarrow is required to read or write Parquet training data")
+
+def iter_training_data(input_file: str) -> Iterator[TrainingPair]:
+    """Stream training pairs from a JSON Lines or Parquet file without loading it whole"""
+    if input_file.endswith('.parquet'):
+        _require_pyarrow()
+        for batch in pq.ParquetFile(input_file).iter_batches():
+            columns = batch.to_pydict()
+            for prompt, completion, kind in zip(columns['prompt'], columns['completion'], columns['kind']):
+                yield TrainingPair(prompt, completion, kind)
+        return
+    
+    with open(input_file, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield TrainingPair(**orjson.loads(line))
+
 class GoDocsScraper:
     """Scraper for Go documentation and examples"""
     
@@ -210,7 +539,53 @@ class GoDocsScraper:
         self.session = requests.Session()
     
     def scrape_documentation(self) -> Dict[str, str]:
-        """Scrape Go documentation"""
+        """Collect Go documentation, preferring the local toolchain over HTTP"""
+        if shutil.which('go'):
+            return self.scrape_package_docs()
+        
+        logger.warning("go binary not found, falling back to scraping golang.org")
+        return self.scrape_documentation_pages()
+    
+    def scrape_package_docs(self) -> Dict[str, str]:
+        """Read plain-text standard library docs with `go doc -all`"""
+        logger.info("Reading Go standard library documentation...")
+        docs = {}
+        
+        try:
+            packages = [
+                pkg for pkg in self._run_go('list', 'std').split()
+                if 'internal' not in pkg.split('/') and not pkg.startswith('vendor/')
+            ]
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.error(f"Error listing standard library packages: {e}")
+            return docs
+        
+        # Each package is a separate process, so run several at a time
+        with ThreadPoolExecutor() as pool:
+            for pkg, content in zip(packages, pool.map(self._go_doc, packages)):
+                if content:
+                    docs[pkg] = content
+        
+        return docs
+    
+    def _go_doc(self, pkg: str) -> Optional[str]:
+        """Return `go doc -all` output for a package"""
+        try:
+            return self._run_go('doc', '-all', pkg)
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.error(f"Error reading documentation for {pkg}: {e}")
+            return None
+    
+    def _run_go(self, *args: str) -> str:
+        """Run a go command outside module mode and return its output"""
+        # Standard library docs need no module; GOPATH mode also keeps a
+        # go.mod in the working directory from triggering toolchain downloads
+        env = {**os.environ, 'GO111MODULE': 'off'}
+        result = subprocess.run(['go', *args], capture_output=True, text=True, check=True, env=env)
+        return result.stdout
+    
+    def scrape_documentation_pages(self) -> Dict[str, str]:
+        """Scrape Go documentation pages from golang.org"""
         logger.info("Scraping Go documentation...")
         docs = {}
         
@@ -251,14 +626,19 @@ class GoDocsScraper:
             response = self.session.get("https://gobyexample.com/")
             response.raise_for_status()
             
-            # Extract code examples (simplified)
-            code_pattern = r'<pre class="code">(.*?)</pre>'
-            matches = re.findall(code_pattern, response.text, re.DOTALL)
+            # Extract code examples
+            if LexborHTMLParser is not None:
+                tree = LexborHTMLParser(response.text)
+                code_blocks = [node.text() for node in tree.css('pre.code')]
+            else:
+                # Clean HTML tags and decode entities
+                code_blocks = [
+                    html.unescape(_RE_HTML_TAG.sub('', match))
+                    for match in _RE_CODE_BLOCK.findall(response.text)
+                ]
             
-            for match in matches:
-                # Clean HTML tags
-                clean_code = re.sub(r'<[^>]+>', '', match)
-                examples.append(clean_code.strip())
+            for code in code_blocks:
+                examples.append(code.strip())
             
         except requests.RequestException as e:
             logger.error(f"Error scraping examples: {e}")
@@ -271,107 +651,257 @@ class GoModelTrainer:
     def __init__(self, config: TrainingConfig):
         self.config = config
         self.processor = GoDataProcessor()
-        self.training_data = []
+        self.training_data: List[TrainingPair] = []
+        self._seen_pairs = set()
     
-    def collect_training_data(self, github_token: str, max_repos: int = 100):
+    def collect_training_data(self, github_token: str, max_repos: int = 100,
+                              output_file: Optional[str] = None):
         """Collect training data from various sources"""
+        asyncio.run(self.collect_training_data_async(github_token, max_repos, output_file))
+    
+    async def collect_training_data_async(self, github_token: str, max_repos: int = 100,
+                                          output_file: Optional[str] = None):
+        """Collect training data from various sources, fetching GitHub files concurrently
+        
+        When output_file is given, accepted pairs are appended to it as JSON
+        Lines while collection is still running, instead of being written
+        by save_training_data afterwards.
+        """
         logger.info("Starting data collection...")
         
-        # GitHub data
-        if github_token:
-            scraper = GitHubGoScraper(github_token)
-            repos = scraper.get_top_go_repos(max_repos)
-            
-            for repo in repos[:50]:  # Limit to top 50 for now
-                repo_name = repo['full_name']
-                logger.info(f"Processing repository: {repo_name}")
-                
-                files = scraper.get_repo_files(repo_name, max_files=20)
+        queue: Optional[asyncio.Queue] = None
+        writer: Optional[asyncio.Task] = None
+        if output_file:
+            queue = asyncio.Queue(maxsize=64)
+            writer = asyncio.create_task(self._write_pairs(queue, output_file))
+        
+        try:
+            # GitHub data
+            if github_token:
+                loop = asyncio.get_running_loop()
                 
-                for file_info in files:
-                    content = scraper.download_file_content(repo_name, file_info['path'])
-                    if content:
-                        cleaned_code = self.processor.clean_go_code(content)
-                        if cleaned_code:
-                            pairs = self.processor.create_training_pairs(
-                                cleaned_code, 
-                                f"from {repo_name}"
+                # Cleaning is CPU-bound regex work, so it runs in worker processes
+                # while other repositories are still downloading
+                with ProcessPoolExecutor() as pool:
+                    async with AsyncGitHubGoScraper(github_token) as scraper:
+                        repos = await scraper.get_top_go_repos(max_repos)
+                        repo_names = [repo['full_name'] for repo in repos[:50]]  # Limit to top 50 for now
+                        
+                        async def fetch_repo(repo_name: str):
+                            # One tree request plus one batched GraphQL request per repository
+                            files = await scraper.get_repo_files(repo_name, max_files=20)
+                            contents = await scraper.download_files(repo_name, [f['path'] for f in files])
+                            pairs = await loop.run_in_executor(
+                                pool, process_go_files, contents, f"from {repo_name}"
                             )
-                            self.training_data.extend(pairs)
-        
-        # Documentation data
-        docs_scraper = GoDocsScraper()
-        docs = docs_scraper.scrape_documentation()
-        examples = docs_scraper.scrape_examples()
-        
-        # Process documentation
-        for page, content in docs.items():
-            if content:
-                pairs = self.processor.create_training_pairs(
-                    content[:1000], 
-                    f"Go documentation from {page}"
-                )
-                self.training_data.extend(pairs)
-        
-        # Process examples
-        for example in examples:
-            if example:
-                pairs = self.processor.create_training_pairs(example, "Go example")
-                self.training_data.extend(pairs)
+                            await self._add_pairs(pairs, queue, writer)
+                        
+                        logger.info(f"Downloading files from {len(repo_names)} repositories...")
+                        await asyncio.gather(*(fetch_repo(name) for name in repo_names))
+            
+            # Documentation data, scraped off the event loop so the writer keeps draining
+            docs_scraper = GoDocsScraper()
+            docs = await asyncio.to_thread(docs_scraper.scrape_documentation)
+            examples = await asyncio.to_thread(docs_scraper.scrape_examples)
+            
+            # Process documentation
+            for page, content in docs.items():
+                if content:
+                    pairs = self.processor.create_training_pairs(
+                        content[:1000], 
+                        f"Go documentation from {page}"
+                    )
+                    await self._add_pairs(pairs, queue, writer)
+            
+            # Process examples
+            for example in examples:
+                if example:
+                    pairs = self.processor.create_training_pairs(example, "Go example")
+                    await self._add_pairs(pairs, queue, writer)
+            
+            if writer:
+                await self._put_batch(queue, writer, None)
+                await writer
+        finally:
+            # Don't leave the writer blocked on the queue when collection fails
+            if writer:
+                writer.cancel()
+                await asyncio.gather(writer, return_exceptions=True)
         
         logger.info(f"Collected {len(self.training_data)} training pairs")
     
-    def save_training_data(self, output_file: str = "training_data.json"):
-        """Save training data to file"""
+    async def _add_pairs(self, pairs: List[TrainingPair], queue: Optional[asyncio.Queue] = None,
+                         writer: Optional[asyncio.Task] = None):
+        """Keep new pairs that pass the duplicate and length checks, queueing them for the writer"""
+        accepted = []
+        for pair in pairs:
+            key = (pair.prompt, pair.completion)
+            if key not in self._seen_pairs and _completion_in_range(pair):
+                self._seen_pairs.add(key)
+                accepted.append(pair)
+        
+        self.training_data.extend(accepted)
+        if queue and accepted:
+            await self._put_batch(queue, writer, accepted)
+    
+    async def _put_batch(self, queue: asyncio.Queue, writer: asyncio.Task,
+                         batch: Optional[List[TrainingPair]]):
+        """Queue a batch for the writer, raising the writer's error if it has stopped
+        
+        A bare queue.put would block forever once the queue is full and
+        nothing is left to drain it.
+        """
+        put = asyncio.ensure_future(queue.put(batch))
+        await asyncio.wait((put, writer), return_when=asyncio.FIRST_COMPLETED)
+        
+        # The writer only returns after the None sentinel, so stopping earlier is a failure
+        if not put.done() or (writer.done() and batch is not None):
+            put.cancel()
+            writer.result()
+            raise RuntimeError("Training data writer stopped before collection finished")
+    
+    async def _write_pairs(self, queue: asyncio.Queue, output_file: str):
+        """Append queued batches of pairs to a JSON Lines file until None is received"""
+        logger.info(f"Streaming training data to {output_file}")
+        
+        with open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            while (pairs := await queue.get()) is not None:
+                lines = [orjson.dumps(pair, option=orjson.OPT_APPEND_NEWLINE) for pair in pairs]
+                # Disk writes run in a thread so they overlap with network I/O
+                await asyncio.to_thread(f.writelines, lines)
+    
+    def filter_training_data(self, min_length: int = MIN_COMPLETION_LENGTH,
+                             max_length: int = MAX_COMPLETION_LENGTH):
+        """Drop duplicate pairs and pairs whose completion length is out of range
+        
+        Used for data loaded from disk; collect_training_data_async applies
+        the same rules incrementally through _add_pairs.
+        """
+        count = len(self.training_data)
+        
+        if pd is not None:
+            # Hash-based deduplication and length filtering run column-wise in C
+            df = pd.DataFrame({
+                'prompt': [pair.prompt for pair in self.training_data],
+                'completion': [pair.completion for pair in self.training_data],
+                'kind': [pair.kind for pair in self.training_data],
+            })
+            df = df.drop_duplicates(subset=['prompt', 'completion'])
+            df = df[df['completion'].str.len().between(min_length, max_length)]
+            self.training_data = [TrainingPair(*row) for row in df.itertuples(index=False, name=None)]
+        else:
+            seen = set()
+            filtered = []
+            for pair in self.training_data:
+                key = (pair.prompt, pair.completion)
+                if key not in seen and _completion_in_range(pair, min_length, max_length):
+                    seen.add(key)
+                    filtered.append(pair)
+            self.training_data = filtered
+        
+        # Keep the incremental filter used during collection in step
+        self._seen_pairs = {(pair.prompt, pair.completion) for pair in self.training_data}
+        
+        logger.info(f"Filtered out {count - len(self.training_data)} duplicate or out-of-range pairs")
+    
+    def save_training_data(self, output_file: str = "training_data.jsonl"):
+        """Save training data to a JSON Lines file, or to Parquet for a .parquet path"""
         logger.info(f"Saving training data to {output_file}")
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.training_data, f, indent=2, ensure_ascii=False)
+        if output_file.endswith('.parquet'):
+            self._save_training_parquet(output_file)
+            return
+        
+        # orjson encodes straight to UTF-8 bytes and never escapes non-ASCII;
+        # TrainingPair dataclasses are serialized natively as JSON objects
+        # A 1 MiB buffer turns the per-line writes into a few large write() calls
+        with open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            f.writelines(
+                orjson.dumps(pair, option=orjson.OPT_APPEND_NEWLINE) for pair in self.training_data
+            )
     
-    def load_training_data(self, input_file: str = "training_data.json"):
-        """Load training data from file"""
+    def _save_training_parquet(self, output_file: str):
+        """Save training data as a columnar Parquet table"""
+        _require_pyarrow()
+        
+        # kind is a four-value categorical, so dictionary encoding stores it as
+        # small integer codes; ZSTD compresses the repeated prompt prefixes
+        table = pa.table({
+            'prompt': [pair.prompt for pair in self.training_data],
+            'completion': [pair.completion for pair in self.training_data],
+            'kind': pa.array([pair.kind for pair in self.training_data]).dictionary_encode(),
+        })
+        pq.write_table(table, output_file, compression='zstd')
+    
+    def load_training_data(self, input_file: str = "training_data.jsonl"):
+        """Load training data from a JSON Lines or Parquet file"""
         logger.info(f"Loading training data from {input_file}")
         
         if os.path.exists(input_file):
-            with open(input_file, 'r', encoding='utf-8') as f:
-                self.training_data = json.load(f)
+            self.training_data = list(iter_training_data(input_file))
             logger.info(f"Loaded {len(self.training_data)} training pairs")
+            
+            # Collection filters pairs as they stream in; files written elsewhere
+            # or concatenated from several runs get the same rules in bulk here
+            self.filter_training_data()
         else:
             logger.warning(f"Training data file {input_file} not found")
     
-    def prepare_dataset(self):
-        """Prepare dataset for training"""
+    def prepare_dataset(self, input_file: Optional[str] = None) -> Iterator[str]:
+        """Prepare dataset for training, yielding one formatted example at a time
+        
+        When input_file is given, pairs are streamed from disk instead of
+        being read from self.training_data.
+        """
         logger.info("Preparing dataset...")
         
-        if not self.training_data:
+        if input_file:
+            pairs = iter_training_data(input_file)
+        elif self.training_data:
+            pairs = self.training_data
+        else:
             logger.error("No training data available")
-            return None
+            return
         
         # Format data for training
-        formatted_data = []
-        for item in self.training_data:
-            text = f"Human: {item['prompt']}\nAssistant: {item['completion']}<|endoftext|>"
-            formatted_data.append(text)
-        
-        return formatted_data
+        for item in pairs:
+            yield f"Human: {item.prompt}\nAssistant: {item.completion}<|endoftext|>"
+    
+    def tokenize_dataset(self, input_file: Optional[str] = None,
+                         batch_size: int = 1024) -> Iterator[Dict[str, List[List[int]]]]:
+        """Tokenize the dataset in batches with the base model's fast tokenizer
+        
+        Each batch is encoded by a single call into the Rust tokenizers
+        library, which spreads the work across cores outside the GIL.
+        """
+        if AutoTokenizer is None:
+            raise ImportError("transformers is required to tokenize the dataset")
+        
+        os.environ.setdefault('TOKENIZERS_PARALLELISM', 'true')
+        tokenizer = AutoTokenizer.from_pretrained(self.config.base_model, use_fast=True)
+        
+        texts = self.prepare_dataset(input_file)
+        while batch := list(islice(texts, batch_size)):
+            yield tokenizer(batch, max_length=self.config.max_length, truncation=True, padding=False)
     
     def train_model(self):
         """Train the model (placeholder for actual training)"""
         logger.info("Starting model training...")
         
-        dataset = self.prepare_dataset()
-        if not dataset:
+        # Counting needs no tokenizer; tokenize_dataset is for the real trainer
+        num_examples = sum(1 for _ in self.prepare_dataset())
+        if not num_examples:
             logger.error("Failed to prepare dataset")
             return
         
         # This is a placeholder - actual training would use transformers library
-        logger.info(f"Training model with {len(dataset)} examples")
+        logger.info(f"Training model with {num_examples} examples")
         logger.info("Model training completed (placeholder)")
         
         # Save model configuration
         config = {
             "base_model": self.config.base_model,
-            "training_examples": len(dataset),
+            "training_examples": num_examples,
             "max_length": self.config.max_length,
             "batch_size": self.config.batch_size,
             "num_epochs": self.config.num_epochs
@@ -401,11 +931,10 @@ def main():
     # Create trainer
     trainer = GoModelTrainer(config)
     
-    # Collect training data
-    trainer.collect_training_data(github_token, max_repos=50)
-    
-    # Save training data
-    trainer.save_training_data()
+    # Collect training data, streaming it to disk as it is produced
+    asyncio.run(trainer.collect_training_data_async(
+        github_token, max_repos=50, output_file="training_data.jsonl"
+    ))
     
     # Train model
     trainer.train_model()
@@ -198,6 +198,10 @@ transformers>=4.21.0
 datasets>=2.0.0
 accelerate>=0.20.0
 requests>=2.28.0
+httpx[http2]>=0.24.0
+google-re2>=1.0
+orjson>=3.8.0
+selectolax>=0.3.12
 numpy>=1.21.0
 scikit-learn>=1.1.0
 tqdm>=4.64.0
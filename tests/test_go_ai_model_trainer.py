@@ -0,0 +1,251 @@
+"""Tests for go-ai-model-trainer.py"""
+
+import asyncio
+import importlib.util
+import re
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import httpx
+import orjson
+
+# The script name is not a valid module name, so load it from its path
+_SPEC = importlib.util.spec_from_file_location(
+    "go_ai_model_trainer", Path(__file__).resolve().parent.parent / "go-ai-model-trainer.py"
+)
+trainer = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(trainer)
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+UNICODE_GO_SOURCE = """package main
+
+type Ü struct {
+    ñ int
+}
+
+type Grüßer interface {
+    Grüß() string
+}
+
+func héllo(a int) int {
+    return a
+}
+
+func plain() error {
+    return nil
+}
+"""
+
+class DeclarationPatternTest(unittest.TestCase):
+    """The declaration patterns must find the same matches on every engine"""
+
+    def extract(self, engine):
+        return [pattern.findall(UNICODE_GO_SOURCE) for pattern in trainer._declaration_patterns(engine)]
+
+    def test_re_matches_unicode_identifiers(self):
+        funcs, interfaces, structs = self.extract(re)
+        self.assertEqual(funcs, [
+            "func héllo(a int) int {\n    return a\n}",
+            "func plain() error {\n    return nil\n}",
+        ])
+        self.assertEqual(interfaces, ["type Grüßer interface {\n    Grüß() string\n}"])
+        self.assertEqual(structs, ["type Ü struct {\n    ñ int\n}"])
+
+    @unittest.skipIf(re2 is None, "google-re2 is not installed")
+    def test_re2_matches_re(self):
+        self.assertEqual(self.extract(re2), self.extract(re))
+
+class GraphQLErrorHandlingTest(unittest.IsolatedAsyncioTestCase):
+    """GraphQL error replies must not be cached and rate limits must be retried"""
+
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.replies = []
+        self.requests = 0
+
+        def handler(request):
+            self.requests += 1
+            return httpx.Response(200, content=orjson.dumps(self.replies.pop(0)))
+
+        self.scraper = trainer.AsyncGitHubGoScraper(
+            "token", cache_path=str(Path(self.tmpdir.name) / "cache.sqlite")
+        )
+        await self.scraper.__aenter__()
+        await self.scraper.client.aclose()
+        self.scraper.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.addAsyncCleanup(self.scraper.__aexit__, None, None, None)
+
+        self.scraper._backoff_delay = lambda headers: None
+        original_delay = trainer.GRAPHQL_RATE_LIMIT_DELAY
+        trainer.GRAPHQL_RATE_LIMIT_DELAY = 0.0
+        self.addCleanup(setattr, trainer, "GRAPHQL_RATE_LIMIT_DELAY", original_delay)
+
+    def blob_reply(self, text):
+        return {"data": {"repository": {"f0": {"text": text}}}}
+
+    async def test_rate_limited_reply_is_retried(self):
+        self.replies = [
+            {"data": None, "errors": [{"type": "RATE_LIMITED", "message": "limit"}]},
+            self.blob_reply("package main"),
+        ]
+        self.assertEqual(await self.scraper.download_files("o/r", ["main.go"]), ["package main"])
+        self.assertEqual(self.requests, 2)
+
+    async def test_error_reply_is_not_cached(self):
+        self.replies = [
+            {"data": None, "errors": [{"type": "INTERNAL", "message": "timeout"}]},
+            self.blob_reply("package main"),
+        ]
+        self.assertEqual(await self.scraper.download_files("o/r", ["main.go"]), [None])
+        self.assertEqual(await self.scraper.download_files("o/r", ["main.go"]), ["package main"])
+        self.assertEqual(self.requests, 2)
+
+        # Successful replies are still served from the cache
+        self.assertEqual(await self.scraper.download_files("o/r", ["main.go"]), ["package main"])
+        self.assertEqual(self.requests, 2)
+
+class KeywordFeaturesTest(unittest.TestCase):
+    """Keyword counts are whole-word matches in keyword_order columns"""
+
+    @unittest.skipIf(trainer.np is None, "numpy is not installed")
+    def test_counts_whole_keywords_in_column_order(self):
+        processor = trainer.GoDataProcessor()
+        codes = [
+            "package main\n\nfunc main() {\n    go work()\n    go work()\n}\n",
+            "// gopher: goto is not go\nfunc f() {\n    goto done\n}\n",
+            "",
+        ]
+        features = processor.keyword_features(codes)
+
+        self.assertEqual(features.shape, (3, len(processor.keyword_order)))
+        column = processor.keyword_order.index
+        self.assertEqual(features[0, column("go")], 2)
+        self.assertEqual(features[0, column("func")], 1)
+        self.assertEqual(features[0, column("package")], 1)
+        self.assertEqual(features[1, column("go")], 1)
+        self.assertEqual(features[1, column("goto")], 2)
+        self.assertEqual(features[2].sum(), 0)
+        self.assertEqual(processor.keyword_order, sorted(processor.go_keywords))
+
+    def test_requires_numpy(self):
+        with mock.patch.object(trainer, "np", None):
+            with self.assertRaises(ImportError):
+                trainer.GoDataProcessor().keyword_features(["package main"])
+
+EXAMPLES_HTML = """
+<pre class="code">package main</pre>
+<pre class="code leftmost"><span class="kd">func</span> main() { x &lt; y }</pre>
+<pre id="imports" class='leftmost code'>import "fmt"</pre>
+<pre data-class="code">not code</pre>
+<pre class="codex">not code</pre>
+"""
+
+class ScrapeExamplesTest(unittest.TestCase):
+    """The selectolax and regex extraction paths must return the same examples"""
+
+    def scrape(self, parser):
+        scraper = trainer.GoDocsScraper()
+        response = mock.Mock(text=EXAMPLES_HTML)
+        with mock.patch.object(scraper.session, "get", return_value=response), \
+             mock.patch.object(trainer, "LexborHTMLParser", parser):
+            return scraper.scrape_examples()
+
+    def test_regex_fallback_matches_class_token(self):
+        self.assertEqual(self.scrape(None), [
+            "package main",
+            "func main() { x < y }",
+            'import "fmt"',
+        ])
+
+    @unittest.skipIf(trainer.LexborHTMLParser is None, "selectolax is not installed")
+    def test_selectolax_matches_regex_fallback(self):
+        self.assertEqual(self.scrape(trainer.LexborHTMLParser), self.scrape(None))
+
+class LoadTrainingDataTest(unittest.TestCase):
+    """Loaded training data goes through the duplicate and length filter"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = str(Path(self.tmpdir.name) / "training_data.jsonl")
+
+        pairs = trainer.GoDataProcessor().create_training_pairs("package main\n\nfunc main() {}\n", "ctx")
+        writer = trainer.GoModelTrainer(trainer.TrainingConfig())
+        writer.training_data = pairs + pairs
+        writer.save_training_data(self.path)
+        self.expected = [pair for pair in pairs if trainer._completion_in_range(pair)]
+
+    def load(self):
+        loaded = trainer.GoModelTrainer(trainer.TrainingConfig())
+        loaded.load_training_data(self.path)
+        return loaded.training_data
+
+    def test_load_deduplicates_and_filters(self):
+        self.assertEqual(self.load(), self.expected)
+
+    def test_fallback_matches_pandas(self):
+        with mock.patch.object(trainer, "pd", None):
+            self.assertEqual(self.load(), self.expected)
+
+class FakeTokenizer:
+    """One token per character, honouring max_length truncation"""
+
+    def __call__(self, texts, max_length, truncation, padding):
+        ids = [list(map(ord, text)) for text in texts]
+        if truncation:
+            ids = [row[:max_length] for row in ids]
+        return {"input_ids": ids}
+
+class TokenizeDatasetTest(unittest.TestCase):
+    """tokenize_dataset encodes the prepared examples in truncated batches"""
+
+    def test_batches_are_chunked_and_truncated(self):
+        model = trainer.GoModelTrainer(trainer.TrainingConfig(max_length=16))
+        model.training_data = [
+            trainer.TrainingPair(prompt=f"prompt {i}", completion="x" * 40, kind="explain")
+            for i in range(5)
+        ]
+
+        auto_tokenizer = mock.Mock()
+        auto_tokenizer.from_pretrained.return_value = FakeTokenizer()
+        with mock.patch.object(trainer, "AutoTokenizer", auto_tokenizer):
+            batches = list(model.tokenize_dataset(batch_size=2))
+
+        self.assertEqual([len(batch["input_ids"]) for batch in batches], [2, 2, 1])
+        texts = list(model.prepare_dataset())
+        self.assertEqual(
+            [ids for batch in batches for ids in batch["input_ids"]],
+            [list(map(ord, text[:16])) for text in texts],
+        )
+
+    def test_requires_transformers(self):
+        model = trainer.GoModelTrainer(trainer.TrainingConfig())
+        with mock.patch.object(trainer, "AutoTokenizer", None):
+            with self.assertRaises(ImportError):
+                next(model.tokenize_dataset())
+
+class CollectTrainingDataTest(unittest.IsolatedAsyncioTestCase):
+    """Collection must surface writer failures instead of blocking on the full queue"""
+
+    async def test_failing_writer_raises(self):
+        # Far more batches than the writer queue holds
+        docs = {f"page{i}": f"package p{i}\n\nfunc F{i}() {{}}\n" for i in range(200)}
+        output_file = str(Path(tempfile.gettempdir()) / "nonexistent" / "dir" / "out.jsonl")
+
+        collector = trainer.GoModelTrainer(trainer.TrainingConfig())
+        with mock.patch.object(trainer.GoDocsScraper, "scrape_documentation", return_value=docs), \
+             mock.patch.object(trainer.GoDocsScraper, "scrape_examples", return_value=[]):
+            with self.assertRaises(FileNotFoundError):
+                await asyncio.wait_for(
+                    collector.collect_training_data_async("", output_file=output_file), timeout=10
+                )
+
+if __name__ == "__main__":
+    unittest.main()